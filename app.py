@@ -1,3 +1,5 @@
+import json
+
 import streamlit as st
 import pandas as pd
 import joblib
@@ -6,6 +8,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+import figures
+
 # ------------------------------
 # Page Configuration
 # ------------------------------
@@ -220,16 +224,124 @@ def load_model():
 
 @st.cache_data
 def load_data():
-    df = pd.read_csv("StressLevelDataset.csv")
-    df["stress_label"] = df["stress_level"].map({
-        0: "Low",
-        1: "Medium",
-        2: "High"
-    })
-    return df
+    return figures.load_dataset()
+
+# ------------------------------
+# Cached model outputs
+# ------------------------------
+# Everything below that does not depend on the sliders is built once per
+# server process and shared by all sessions. A slider change only reruns the
+# memoized prediction and adds the "You" overlays to copies of the base figures.
+
+color_discrete_map = figures.color_discrete_map
+pred_val_map = figures.pred_val_map
+
+@st.cache_resource
+def load_top_factors():
+    model, features = load_model()
+    return figures.top_factor_ranking(model, features)
+
+@st.cache_data(max_entries=10000)
+def predict(values):
+    # Sliders are 0-3, so there are at most 4**7 distinct inputs to memoize
+    model, features = load_model()
+    input_df = pd.DataFrame([values], columns=features)
+    stress_pred = model.predict(input_df)[0]
+    risk_score = float(model.predict_proba(input_df).max() * 100)
+    return stress_pred, risk_score
+
+# ------------------------------
+# Cached figure bases
+# ------------------------------
+# Bases are cached as JSON strings and each rerun parses its own copy with
+# from_base(). Sharing a go.Figure or dict is not safe: plotly briefly pops
+# "type" out of the trace dicts it is given, which corrupts the base for any
+# concurrent session reading it.
+
+def from_base(base_json):
+    return go.Figure(json.loads(base_json))
+
+
+@st.cache_resource
+def top_factors_figure():
+    return figures.top_factors_figure(*load_top_factors()).to_json()
+
+@st.cache_resource
+def stress_distribution_base():
+    df = load_data()
+
+    # Stress Distribution
+    fig1 = px.histogram(
+        df,
+        x="stress_level",
+        color="stress_label",
+        nbins=3,
+        title=" Distribution of Stress Levels",
+        labels={"stress_level": "Stress Level", "count": "Number of Students"},
+        text_auto=True,
+        color_discrete_map=color_discrete_map
+    )
+
+    fig1.update_layout(
+        template="plotly_dark",
+        title_font_size=20,
+        title_font_color="white",
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(color='white')),
+        height=460,
+        margin=dict(l=0, r=40, t=170, b=10),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(255,255,255,0.05)',
+        font=dict(color='white', family='Poppins')
+    )
+    return fig1.to_json()
+
+@st.cache_resource
+def radar_base():
+    _, features = load_model()
+    fig_radar, categories = figures.radar_base(load_data(), features)
+    return fig_radar.to_json(), categories
+
+@st.cache_resource
+def mental_health_base():
+    return figures.mental_health_base(load_data()).to_json()
+
+@st.cache_resource
+def correlation_base(x, y, title, labels=None, yaxis_title=None):
+    df = load_data()
+
+    # The OLS trendlines are the most expensive part of the page
+    fig = px.scatter(
+        df,
+        x=x,
+        y=y,
+        color="stress_label",
+        trendline="ols",
+        title=title,
+        labels=labels,
+        color_discrete_map=color_discrete_map,
+        opacity=0.7
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        title_font_size=20,
+        title_font_color="white",
+        height=400,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(255,255,255,0.05)',
+        font=dict(color='white', family='Poppins'),
+        legend=dict(font=dict(color='white'))
+    )
+    if yaxis_title:
+        fig.update_layout(yaxis=dict(title=yaxis_title))
+    return fig.to_json()
+
+@st.cache_resource
+def sleep_quality_base():
+    return figures.sleep_quality_base(load_data()).to_json()
 
 model, features = load_model()
-df = load_data()
 
 # ------------------------------
 # Header
@@ -267,18 +379,12 @@ for feature in features:
 st.sidebar.markdown("---")
 st.sidebar.info(" Adjust the sliders to see real-time predictions!")
 
-input_df = pd.DataFrame([user_input])[features]
-
 # ------------------------------
 # Stress Prediction
 # ------------------------------
-stress_pred = model.predict(input_df)[0]
-risk_score = float(model.predict_proba(input_df).max() * 100)
-
-# Top contributing factors
-coef = pd.Series(model.coef_[0], index=features)
-top_factors = coef.abs().sort_values(ascending=False).head(3)
-top_factor_names = [f.replace('_', ' ').title() for f in top_factors.index.tolist()]
+stress_pred, risk_score = predict(tuple(user_input[f] for f in features))
+top_factors, top_factor_names = load_top_factors()
+user_stress_numeric = pred_val_map.get(stress_pred, 1)
 
 # ------------------------------
 # Main Dashboard Layout
@@ -288,89 +394,26 @@ top_factor_names = [f.replace('_', ' ').title() for f in top_factors.index.tolis
 col1, col2, col3 = st.columns([2, 2, 3])
 
 with col1:
-    
+
     # Stress level with color-coded badge
     stress_class = f"stress-{stress_pred.lower()}"
     st.markdown(f"<div class='stress-badge {stress_class}'>{stress_pred}</div>", unsafe_allow_html=True)
-    
+
     st.markdown("</div>", unsafe_allow_html=True)
 
 with col2:
-   
-    # Create a gauge chart for confidence
-    fig_gauge = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=risk_score,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "Confidence Score", 'font': {'size': 22, 'color': 'white', 'weight': 'bold'}},
-        number={'suffix': "%", 'font': {'size': 40, 'color': 'white', 'family': 'Poppins'}},
-        gauge={
-            'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': "white"},
-            'bar': {'color': "#fbbf24", 'thickness': 0.8},
-            'bgcolor': "rgba(255,255,255,0.1)",
-            'borderwidth': 3,
-            'bordercolor': "rgba(255,255,255,0.3)",
-            'steps': [
-                {'range': [0, 33], 'color': 'rgba(16, 185, 129, 0.3)'},
-                {'range': [33, 66], 'color': 'rgba(245, 158, 11, 0.3)'},
-                {'range': [66, 100], 'color': 'rgba(239, 68, 68, 0.3)'}
-            ],
-            'threshold': {
-                'line': {'color': "white", 'width': 4},
-                'thickness': 0.75,
-                'value': 80
-            }
-        }
-    ))
-    
-    fig_gauge.update_layout(
-        height=250,
-        margin=dict(l=20, r=20, t=50, b=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'color': "white", 'family': "Poppins"}
-    )
-    
+
+    fig_gauge = figures.gauge_figure(risk_score)
+
     st.plotly_chart(fig_gauge, use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with col3:
-    
+
     st.markdown("<p style='color: white; font-size:22px; font-weight:bold;'>Top Factors</p>", unsafe_allow_html=True)
-    
-    # Create horizontal bar chart for top factors with better colors
-    colors_map = {
-        0: '#10b981',  # Green
-        1: '#f59e0b',  # Orange
-        2: '#ef4444'   # Red
-    }
-    
-    bar_colors = [colors_map[i] for i in range(len(top_factors))]
-    
-    fig_factors = go.Figure(go.Bar(
-        y=top_factor_names,
-        x=top_factors.abs().values,
-        orientation='h',
-        marker=dict(
-            color=bar_colors,
-            line=dict(color='rgba(255, 255, 255, 0.5)', width=2)
-        ),
-        text=[f'{val:.2f}' for val in top_factors.abs().values],
-        textposition='auto',
-        textfont=dict(color='white', size=14, family='Poppins', weight='bold')
-    ))
-    
-    fig_factors.update_layout(
-    height=250,
-    margin=dict(l=210, r=10, t=0, b=20, autoexpand=False),  # Fixed margins
-    paper_bgcolor='rgba(0,0,0,0)',
-    plot_bgcolor='rgba(0,0,0,0)',
-    xaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
-    yaxis=dict(showgrid=False, tickfont=dict(color='white', size=16, family='Poppins'), automargin=False),
-    font={'family': "Poppins", 'size': 16, 'color': 'white'},
-    showlegend=False
-)
-    
-    st.plotly_chart(fig_factors, use_container_width=True)
+
+    # Model-only chart: identical for every user, so it is built from the cached base as-is
+    st.plotly_chart(from_base(top_factors_figure()), use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 # Row 2: Advice Section
@@ -401,48 +444,14 @@ st.markdown("---")
 st.markdown("<h2 style='text-align: center; font-weight:bold;'> Interactive Visualizations</h2>", unsafe_allow_html=True)
 st.markdown("<br>", unsafe_allow_html=True)
 
-# Prepare prediction value mapping
-pred_val_map = {"Low": 0, "Medium": 1, "High": 2}
-user_stress_numeric = pred_val_map.get(stress_pred, 1)
-
-# Color scheme - More vibrant
-color_discrete_map = {
-    "Low": "#10b981",
-    "Medium": "#f59e0b", 
-    "High": "#ef4444"
-}
-
 # Row 3: Distribution Charts
 col1, col2 = st.columns(2)
 
 with col1:
-   
-    
-    # Stress Distribution
-    fig1 = px.histogram(
-        df,
-        x="stress_level",
-        color="stress_label",
-        nbins=3,
-        title=" Distribution of Stress Levels",
-        labels={"stress_level": "Stress Level", "count": "Number of Students"},
-        text_auto=True,
-        color_discrete_map=color_discrete_map
-    )
-    
-    fig1.update_layout(
-        template="plotly_dark",
-        title_font_size=20,
-        title_font_color="white",
-        showlegend=True,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(color='white')),
-        height=460,
-        margin=dict(l=0, r=40, t=170, b=10),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(255,255,255,0.05)',
-        font=dict(color='white', family='Poppins')
-    )
-    
+
+
+    fig1 = from_base(stress_distribution_base())
+
     # Add user prediction marker
     fig1.add_scatter(
         x=[user_stress_numeric],
@@ -454,115 +463,26 @@ with col1:
         textposition="top center",
         textfont=dict(size=14, color="white", family="Poppins", weight='bold')
     )
-    
+
     st.plotly_chart(fig1, use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with col2:
-   
-    
-    # Radar chart for user profile
-    categories = [f.replace('_', ' ').title() for f in features]
-    user_values = [user_input[f] for f in features]
-    avg_values = [df[f].mean() for f in features]
-    
-    fig_radar = go.Figure()
-    
-    # Average student profile
-    fig_radar.add_trace(go.Scatterpolar(
-        r=avg_values,
-        theta=categories,
-        fill='toself',
-        name='Average Student',
-        line_color='rgba(59, 130, 246, 0.8)',
-        fillcolor='rgba(59, 130, 246, 0.3)',
-        line_width=3
-    ))
-    
-    # User profile
-    fig_radar.add_trace(go.Scatterpolar(
-        r=user_values,
-        theta=categories,
-        fill='toself',
-        name='Your Profile',
-        line_color='#fbbf24',
-        fillcolor='rgba(251, 191, 36, 0.3)',
-        line_width=3
-    ))
-    
-    fig_radar.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 3],
-                tickfont=dict(size=10, color='white'),
-                gridcolor='rgba(255,255,255,0.2)'
-            ),
-            angularaxis=dict(
-                tickfont=dict(size=11, color='white'),
-                gridcolor='rgba(255,255,255,0.2)'
-            ),
-            bgcolor='rgba(255,255,255,0.05)'
-        ),
-        showlegend=True,
-        title=" Your Profile vs Average Student",
-        title_font_size=20,
-        title_font_color="white",
-        height=430,
-        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5, font=dict(color='white')),
-        paper_bgcolor='rgba(1,0,0,0)',
-        font=dict(color='white', family='Poppins')
-    )
-    
-    st.plotly_chart(fig_radar, use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
 
-# Row 4: Mental Health Factors
 
+    base_radar, categories = radar_base()
+    fig_radar = from_base(base_radar)
+    figures.add_radar_overlay(fig_radar, categories, [user_input[f] for f in features])
 
-mental_cols = ["anxiety_level", "social_support", "future_career_concerns"]
-df_long = df.melt(
-    id_vars="stress_label",
-    value_vars=mental_cols,
-    var_name="Feature",
-    value_name="Score"
-)
+    st.plotly_chart(fig_radar, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
 
-df_long["Feature"] = df_long["Feature"].apply(lambda x: x.replace('_', ' ').title())
+# Row 4: Mental Health Factors
 
-fig2 = px.box(
-    df_long,
-    x="stress_label",
-    y="Score",
-    color="Feature",
-    title=" Mental Health & Support Factors Across Stress Levels",
-    color_discrete_sequence=['#3b82f6', '#8b5cf6', '#ec4899']
-)
 
-# Add user input points
-for i, feature in enumerate(mental_cols):
-    fig2.add_scatter(
-        x=[stress_pred],
-        y=[input_df[feature].values[0]],
-        mode="markers",
-        marker=dict(size=16, color='#fbbf24', symbol="diamond", line=dict(color='white', width=3)),
-        name=f"Your {feature.replace('_', ' ').title()}",
-        showlegend=(i == 0),
-        legendgroup="user"
-    )
+fig2 = from_base(mental_health_base())
 
-fig2.update_layout(
-    template="plotly_dark",
-    title_font_size=20,
-    title_font_color="white",
-    height=450,
-    xaxis_title="Stress Level",
-    yaxis_title="Score",
-    paper_bgcolor='rgba(0,0,0,0)',
-    plot_bgcolor='rgba(255,255,255,0.05)',
-    font=dict(color='white', family='Poppins'),
-    legend=dict(font=dict(color='white'))
-)
+figures.add_mental_health_overlay(fig2, stress_pred, user_input)
 
 st.plotly_chart(fig2, use_container_width=True)
 st.markdown("</div>", unsafe_allow_html=True)
@@ -571,76 +491,44 @@ st.markdown("</div>", unsafe_allow_html=True)
 col1, col2 = st.columns(2)
 
 with col1:
- 
-    
-    fig3 = px.scatter(
-        df,
-        x="sleep_quality",
-        y="study_load",
-        color="stress_label",
-        trendline="ols",
-        title=" Sleep Quality vs Study Load",
-        labels={"sleep_quality": "Sleep Quality", "study_load": "Study Load"},
-        color_discrete_map=color_discrete_map,
-        opacity=0.7
-    )
-    
+
+
+    fig3 = from_base(correlation_base(
+        "sleep_quality",
+        "study_load",
+        " Sleep Quality vs Study Load",
+        labels={"sleep_quality": "Sleep Quality", "study_load": "Study Load"}
+    ))
+
     fig3.add_scatter(
-        x=[input_df["sleep_quality"].values[0]],
-        y=[input_df["study_load"].values[0]],
+        x=[user_input["sleep_quality"]],
+        y=[user_input["study_load"]],
         mode="markers",
         marker=dict(size=22, color="#fbbf24", symbol="star", line=dict(color='white', width=3)),
         name=" You"
     )
-    
-    fig3.update_layout(
-        template="plotly_dark",
-        title_font_size=20,
-        title_font_color="white",
-        height=400,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(255,255,255,0.05)',
-        font=dict(color='white', family='Poppins'),
-        legend=dict(font=dict(color='white'))
-    )
-    
+
     st.plotly_chart(fig3, use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with col2:
 
-    
-    fig4 = px.scatter(
-        df,
-        x="study_load",
-        y="academic_performance",
-        color="stress_label",
-        trendline="ols",
-        title=" Study Load vs Academic Performance",
-        labels={"study_load": "Study Load", "academic_performance": "Academic Performance"},
-        color_discrete_map=color_discrete_map,
-        opacity=0.7
-    )
-    
+
+    fig4 = from_base(correlation_base(
+        "study_load",
+        "academic_performance",
+        " Study Load vs Academic Performance",
+        labels={"study_load": "Study Load", "academic_performance": "Academic Performance"}
+    ))
+
     fig4.add_scatter(
-        x=[input_df["study_load"].values[0]],
-        y=[input_df["academic_performance"].values[0]],
+        x=[user_input["study_load"]],
+        y=[user_input["academic_performance"]],
         mode="markers",
         marker=dict(size=22, color="#fbbf24", symbol="star", line=dict(color='white', width=3)),
         name="You"
     )
-    
-    fig4.update_layout(
-        template="plotly_dark",
-        title_font_size=20,
-        title_font_color="white",
-        height=400,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(255,255,255,0.05)',
-        font=dict(color='white', family='Poppins'),
-        legend=dict(font=dict(color='white'))
-    )
-    
+
     st.plotly_chart(fig4, use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -648,74 +536,33 @@ with col2:
 col1, col2 = st.columns(2)
 
 with col1:
-    
-    
-    fig5 = px.scatter(
-        df,
-        x="peer_pressure",
-        y="stress_level",
-        color="stress_label",
-        trendline="ols",
-        title=" Peer Pressure vs Stress Level",
-        color_discrete_map=color_discrete_map,
-        opacity=0.7
-    )
-    
+
+
+    fig5 = from_base(correlation_base(
+        "peer_pressure",
+        "stress_level",
+        " Peer Pressure vs Stress Level",
+        yaxis_title="Stress Level"
+    ))
+
     fig5.add_scatter(
-        x=[input_df["peer_pressure"].values[0]],
+        x=[user_input["peer_pressure"]],
         y=[user_stress_numeric],
         mode="markers",
         marker=dict(size=22, color="#fbbf24", symbol="star", line=dict(color='white', width=3)),
         name="You"
     )
-    
-    fig5.update_layout(
-        template="plotly_dark",
-        title_font_size=20,
-        title_font_color="white",
-        yaxis=dict(title="Stress Level"),
-        height=400,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(255,255,255,0.05)',
-        font=dict(color='white', family='Poppins'),
-        legend=dict(font=dict(color='white'))
-    )
-    
+
     st.plotly_chart(fig5, use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 with col2:
-    
-    
-    fig6 = px.box(
-        df,
-        x="stress_label",
-        y="sleep_quality",
-        color="stress_label",
-        title=" Sleep Quality Distribution by Stress Level",
-        labels={"stress_label": "Stress Level", "sleep_quality": "Sleep Quality"},
-        color_discrete_map=color_discrete_map
-    )
-    
-    fig6.add_scatter(
-        x=[stress_pred],
-        y=[input_df["sleep_quality"].values[0]],
-        mode="markers",
-        marker=dict(size=22, color="#fbbf24", symbol="star", line=dict(color='white', width=3)),
-        name="You"
-    )
-    
-    fig6.update_layout(
-        template="plotly_dark",
-        title_font_size=20,
-        title_font_color="white",
-        height=400,
-        showlegend=False,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(255,255,255,0.05)',
-        font=dict(color='white', family='Poppins')
-    )
-    
+
+
+    fig6 = from_base(sleep_quality_base())
+
+    figures.add_sleep_quality_overlay(fig6, stress_pred, user_input["sleep_quality"])
+
     st.plotly_chart(fig6, use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
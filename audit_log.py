@@ -0,0 +1,222 @@
+# audit_log.py
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    model_version TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    stress_level TEXT NOT NULL,
+    risk_score REAL,
+    top_factors TEXT,
+    source TEXT NOT NULL DEFAULT 'computed'
+)
+"""
+
+INSERT = """
+INSERT INTO predictions (timestamp, model_version, inputs, stress_level, risk_score, top_factors, source)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def model_version(path):
+    """Short content hash of the model file, so every record names the exact model used."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+# -------------------------
+# Audit Logger
+# -------------------------
+class AuditLogger:
+    """
+    Buffers prediction records in memory and writes them to SQLite in bulk.
+
+    `log` only puts a tuple on a bounded queue; a background thread drains it
+    and commits one `executemany` per batch, so the request thread never
+    touches the disk. When the queue is full the logger either blocks for up
+    to `block_timeout` seconds (backpressure on the caller) or, with
+    `on_full="drop"`, drops the record and counts it.
+
+    A failed batch (locked database, full disk, ...) is retried with
+    exponential backoff on a fresh connection instead of killing the writer.
+    While the writer is failing, `log` never blocks: records queue up to
+    `max_queue` and anything beyond that is dropped, so a broken disk cannot
+    stall requests. `stats()` reports the writer's health.
+    """
+
+    def __init__(self, path="audit_log.db", model_version="unknown", max_queue=10000,
+                 batch_size=500, flush_interval=0.5, on_full="block", block_timeout=1.0,
+                 retry_base=0.1, retry_max=5.0, shutdown_retries=3):
+        if on_full not in ("block", "drop"):
+            raise ValueError("on_full must be 'block' or 'drop'")
+        self.path = path
+        self.model_version = model_version
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_full = on_full
+        self.block_timeout = block_timeout
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.shutdown_retries = shutdown_retries
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self.written = 0
+        self.dropped = 0
+        self.failed_writes = 0
+        self.consecutive_failures = 0
+        self.last_error = None
+
+        # close() waits for in-flight log() calls, so no record can be queued
+        # after the writer's final drain
+        self._state = threading.Condition()
+        self._closed = False
+        self._in_flight = 0
+
+        # Create the table up front so configuration errors surface at startup
+        conn = self._connect()
+        conn.close()
+
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(SCHEMA)
+        # Databases created before the source column existed
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(predictions)")}
+        if "source" not in columns:
+            conn.execute("ALTER TABLE predictions ADD COLUMN source TEXT NOT NULL DEFAULT 'computed'")
+        conn.commit()
+        return conn
+
+    def log(self, inputs, stress_level, risk_score=None, top_factors=None, model_version=None,
+            source="computed"):
+        """
+        Queue one prediction record. Returns False if it was dropped.
+
+        `source` tells whether the response was computed for this request or
+        served by deduplication ("coalesced" / "cached").
+        """
+        with self._state:
+            if self._closed:
+                raise RuntimeError("AuditLogger is closed")
+            self._in_flight += 1
+        try:
+            return self._enqueue(inputs, stress_level, risk_score, top_factors, model_version, source)
+        finally:
+            with self._state:
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._state.notify_all()
+
+    def _enqueue(self, inputs, stress_level, risk_score, top_factors, model_version, source):
+        record = (
+            time.time(),
+            model_version or self.model_version,
+            json.dumps(inputs, sort_keys=True),
+            str(stress_level),
+            risk_score,
+            json.dumps(top_factors or []),
+            source,
+        )
+        try:
+            if self.on_full == "drop" or self.consecutive_failures:
+                self._queue.put_nowait(record)
+            else:
+                self._queue.put(record, timeout=self.block_timeout)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _drain(self, first=None):
+        batch = [] if first is None else [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, conn, batch):
+        """Write one batch, retrying with backoff. Returns the connection to reuse."""
+        attempt = 0
+        while True:
+            try:
+                if conn is None:
+                    conn = self._connect()
+                conn.executemany(INSERT, batch)
+                conn.commit()
+                self.written += len(batch)
+                self.consecutive_failures = 0
+                return conn
+            except sqlite3.Error as e:
+                self.failed_writes += 1
+                self.consecutive_failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except sqlite3.Error:
+                        pass
+                    conn = None
+
+                attempt += 1
+                # Don't hang shutdown on a store that stays broken
+                if self._stop.is_set() and attempt >= self.shutdown_retries:
+                    self.dropped += len(batch)
+                    return conn
+                time.sleep(min(self.retry_base * 2 ** (attempt - 1), self.retry_max))
+
+    def _run(self):
+        conn = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                conn = self._write(conn, self._drain(first))
+
+            # Shutdown: flush whatever is still buffered
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                conn = self._write(conn, batch)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            # A writer that stopped after close() is not a failure
+            "healthy": self.consecutive_failures == 0 and (self._writer.is_alive() or self._stop.is_set()),
+            "writer_alive": self._writer.is_alive(),
+            "failed_writes": self.failed_writes,
+            "last_error": self.last_error,
+        }
+
+    def close(self, timeout=10.0):
+        """Stop accepting records, flush the buffer and wait for the writer to finish."""
+        with self._state:
+            self._closed = True
+            self._state.wait_for(lambda: self._in_flight == 0, timeout)
+        self._stop.set()
+        self._writer.join(timeout)
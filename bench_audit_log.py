@@ -0,0 +1,58 @@
+# bench_audit_log.py
+# Measures /predict-stress latency with and without the audit logger.
+# Usage: python bench_audit_log.py [n_requests]
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+# Start the app without its default logger; each run below installs its own.
+# Deduplication is off so repeated sampled rows are really scored every time.
+os.environ["AUDIT_LOG_PATH"] = ""
+os.environ["DEDUP_TTL_SECONDS"] = "0"
+import main  # noqa: E402
+from audit_log import AuditLogger  # noqa: E402
+
+
+def sample_payloads(n, seed=0):
+    rows = main.reference_df.drop(columns="stress_level").sample(n, replace=True, random_state=seed)
+    return [{k: int(v) for k, v in row.items()} for row in rows.to_dict("records")]
+
+
+def run(client, payloads):
+    latencies = []
+    for payload in payloads:
+        start = time.perf_counter()
+        client.post("/predict-stress", json=payload)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def summarize(name, latencies):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{name:<16} mean={latencies.mean():.3f}ms p50={p50:.3f}ms p95={p95:.3f}ms p99={p99:.3f}ms")
+    return latencies.mean()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    payloads = sample_payloads(n)
+    client = TestClient(main.app)
+    run(client, payloads[:100])  # warm-up
+
+    main.audit_logger = None
+    baseline = summarize("no audit log", run(client, payloads))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = AuditLogger(os.path.join(tmp, "audit.db"), model_version="bench")
+        main.audit_logger = logger
+        with_log = summarize("audit log", run(client, payloads))
+        start = time.perf_counter()
+        logger.close()
+        print(f"shutdown flush   {(time.perf_counter() - start) * 1000:.1f}ms, stats={logger.stats()}")
+        main.audit_logger = None
+
+    print(f"overhead per request: {with_log - baseline:+.3f}ms ({(with_log / baseline - 1) * 100:+.1f}%)")
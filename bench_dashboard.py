@@ -0,0 +1,36 @@
+# bench_dashboard.py
+# Measures app.py rerun time for a single slider change, the interaction that
+# dominates dashboard traffic. Usage: python bench_dashboard.py [n_interactions]
+import sys
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+
+def run(n):
+    at = AppTest.from_file("app.py", default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    first = (time.perf_counter() - start) * 1000
+
+    sliders = list(at.sidebar.slider)
+    wall, cpu = [], []
+    for i in range(n):
+        slider = sliders[i % len(sliders)]
+        slider.set_value((slider.value + 1) % 4)
+        start, start_cpu = time.perf_counter(), time.process_time()
+        at.run()
+        wall.append((time.perf_counter() - start) * 1000)
+        cpu.append((time.process_time() - start_cpu) * 1000)
+        assert not at.exception, at.exception
+    return first, np.array(wall), np.array(cpu)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    first, wall, cpu = run(n)
+    p50, p95 = np.percentile(wall, [50, 95])
+    print(f"first run        {first:.1f}ms")
+    print(f"slider rerun     mean={wall.mean():.1f}ms p50={p50:.1f}ms p95={p95:.1f}ms")
+    print(f"slider rerun cpu mean={cpu.mean():.1f}ms")
@@ -0,0 +1,79 @@
+# bench_ensemble.py
+# Concurrency check for ensemble serving: many simultaneous batch calls share
+# one EnsembleScorer, first with the registered models as they are, then with
+# one member slowed past its timeout to show the fallback to the others.
+# Usage: python bench_ensemble.py [concurrency] [calls_per_thread] [batch_size]
+import sys
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from ensemble import EnsembleScorer
+
+
+class SlowModel:
+    """Wraps a model and delays predict_proba, standing in for a stuck member."""
+
+    def __init__(self, model, delay):
+        self.model = model
+        self.delay = delay
+        self.classes_ = model.classes_
+
+    def predict_proba(self, X):
+        time.sleep(self.delay)
+        return self.model.predict_proba(X)
+
+
+def run(scorer, batches, concurrency):
+    lock = threading.Lock()
+    latencies, outcomes, members = [], Counter(), Counter()
+
+    def worker(thread_batches):
+        for X in thread_batches:
+            start = time.perf_counter()
+            try:
+                result = scorer.score(X)
+                outcome = "ok" if all(s == "ok" for s in result["members"].values()) else "degraded"
+            except RuntimeError:
+                result, outcome = None, "failed"
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+                outcomes[outcome] += 1
+                if result is not None:
+                    members.update(f"{name}={status}" for name, status in result["members"].items())
+
+    threads = [threading.Thread(target=worker, args=(batches[i::concurrency],)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return np.array(latencies), outcomes, members
+
+
+def summarize(name, latencies, outcomes, members):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{name:<14} calls={len(latencies)} p50={p50:.1f}ms p95={p95:.1f}ms p99={p99:.1f}ms")
+    print(f"{'':<14} outcomes={dict(outcomes)}")
+    print(f"{'':<14} members={dict(sorted(members.items()))}")
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    df = pd.read_csv("StressLevelDataset.csv")
+    batches = [df.sample(batch_size, replace=True, random_state=i) for i in range(concurrency * calls)]
+
+    # Same sizing rule as main.py: one set of workers per concurrent caller
+    with EnsembleScorer.from_registry("models/ensemble.json", concurrency=concurrency) as scorer:
+        scorer.score(batches[0])  # warm-up
+        summarize("all members", *run(scorer, batches, concurrency))
+
+        slow = scorer.members[-1]
+        timeout = slow["timeout"] if slow["timeout"] is not None else scorer.default_timeout
+        slow["model"] = SlowModel(slow["model"], delay=2 * timeout)
+        summarize(f"slow {slow['name']}", *run(scorer, batches, concurrency))
@@ -0,0 +1,111 @@
+# dedup.py
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_key(payload):
+    """Stable hash of a request body, independent of key order."""
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return "hash:" + hashlib.sha256(blob.encode()).hexdigest()
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused with a different request body."""
+
+
+class _InFlight:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# -------------------------
+# Request Coalescer
+# -------------------------
+class RequestCoalescer:
+    """
+    Shares one computation between duplicate requests.
+
+    Concurrent calls with the same key wait on the first caller's result
+    instead of recomputing it, and later repeats within `ttl` seconds get the
+    stored response. Failures are passed to the waiting duplicates but never
+    cached, so a retry after an error is computed again. At most `max_entries`
+    responses are kept, oldest evicted first.
+
+    `fingerprint` (e.g. the content hash of the body) is stored with each key;
+    reusing a key with a different fingerprint raises IdempotencyConflict
+    instead of returning another request's response.
+
+    `run` returns `(result, source)`, where source is "computed", "coalesced"
+    or "cached", so callers can tell which requests actually ran `compute`.
+    """
+
+    def __init__(self, ttl=30.0, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # key -> (expires_at, fingerprint, result)
+        self._in_flight = {}
+        self.computed = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def _check(self, key, stored, fingerprint):
+        if stored != fingerprint:
+            raise IdempotencyConflict(f"Key {key!r} was already used with a different request body")
+
+    def run(self, key, compute, fingerprint=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._check(key, entry[1], fingerprint)
+                    self.cache_hits += 1
+                    return entry[2], "cached"
+                del self._cache[key]
+
+            pending = self._in_flight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._in_flight[key] = _InFlight(fingerprint)
+            else:
+                self._check(key, pending.fingerprint, fingerprint)
+                self.coalesced += 1
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.result, "coalesced"
+
+        try:
+            pending.result = compute()
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self.computed += 1
+                del self._in_flight[key]
+                if pending.error is None:
+                    self._cache[key] = (time.monotonic() + self.ttl, fingerprint, pending.result)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+            pending.done.set()
+        return pending.result, "computed"
+
+    def stats(self):
+        with self._lock:
+            return {
+                "computed": self.computed,
+                "coalesced_in_flight": self.coalesced,
+                "cache_hits": self.cache_hits,
+                "saved_computations": self.coalesced + self.cache_hits,
+                "cached_entries": len(self._cache),
+            }
@@ -0,0 +1,134 @@
+# ensemble.py
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import joblib
+import numpy as np
+
+
+class _MemberCall:
+    def __init__(self):
+        self.started = threading.Event()
+        self.started_at = None
+
+
+class EnsembleScorer:
+    """
+    Scores a batch against several registered models at once.
+
+    Each member's `predict_proba` runs on a shared thread pool (sklearn and
+    NumPy release the GIL for most of the work). Members that miss their
+    timeout or raise are left out and the remaining probabilities are
+    combined as a weighted average, so one slow model degrades the answer
+    instead of stalling the request. The pool has one worker per member for
+    each of `concurrency` requests scoring at once; a timed-out call keeps
+    its worker until it finishes, so `concurrency` should cover the callers'
+    own thread count with some room to spare.
+
+    A member's timeout starts when a worker picks it up, so concurrent
+    requests queueing for the pool don't make healthy models look slow.
+    Time spent waiting in the queue is bounded separately by
+    `queue_timeout`; a call still queued after that is cancelled and
+    reported as "queue_timeout".
+    """
+
+    def __init__(self, members, features, max_workers=None, default_timeout=0.2, queue_timeout=2.0,
+                 concurrency=2):
+        if not members:
+            raise ValueError("An ensemble needs at least one model")
+        self.members = members
+        self.features = list(features)
+        self.default_timeout = default_timeout
+        self.queue_timeout = queue_timeout
+        self.classes_ = np.array(sorted({c for m in members for c in m["model"].classes_}))
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or concurrency * len(members),
+            thread_name_prefix="ensemble",
+        )
+
+    @classmethod
+    def from_registry(cls, path, **kwargs):
+        with open(path) as f:
+            registry = json.load(f)
+
+        base_dir = os.path.dirname(os.path.abspath(path))
+        members = []
+        for entry in registry["models"]:
+            members.append({
+                "name": entry["name"],
+                "model": joblib.load(os.path.join(base_dir, entry["path"])),
+                "weight": float(entry.get("weight", 1.0)),
+                "timeout": entry["timeout_ms"] / 1000 if "timeout_ms" in entry else None,
+            })
+        return cls(members, registry["features"], **kwargs)
+
+    def _aligned_proba(self, model, X):
+        # Members may list classes in a different order (or miss one)
+        proba = model.predict_proba(X)
+        aligned = np.zeros((len(X), len(self.classes_)))
+        for j, label in enumerate(model.classes_):
+            aligned[:, np.searchsorted(self.classes_, label)] = proba[:, j]
+        return aligned
+
+    def _run_member(self, call, model, X):
+        call.started_at = time.monotonic()
+        call.started.set()
+        return self._aligned_proba(model, X)
+
+    def score(self, X):
+        X = X[self.features]
+        queue_deadline = time.monotonic() + self.queue_timeout
+        futures = []
+        for member in self.members:
+            call = _MemberCall()
+            futures.append((member, call, self._pool.submit(self._run_member, call, member["model"], X)))
+
+        combined = np.zeros((len(X), len(self.classes_)))
+        total_weight = 0.0
+        status = {}
+        for member, call, future in futures:
+            if not call.started.wait(max(0.0, queue_deadline - time.monotonic())):
+                if future.cancel():
+                    status[member["name"]] = "queue_timeout"
+                    continue
+                # A worker took it just now
+                call.started.wait()
+
+            # Timeouts count from when the member started running, not from
+            # when we got around to waiting on it
+            timeout = member["timeout"] if member["timeout"] is not None else self.default_timeout
+            remaining = max(0.0, call.started_at + timeout - time.monotonic())
+            try:
+                proba = future.result(timeout=remaining)
+            except FutureTimeout:
+                future.cancel()
+                status[member["name"]] = "timeout"
+                continue
+            except Exception as e:
+                status[member["name"]] = f"error: {e}"
+                continue
+            combined += member["weight"] * proba
+            total_weight += member["weight"]
+            status[member["name"]] = "ok"
+
+        if total_weight == 0:
+            raise RuntimeError(f"No ensemble member returned in time: {status}")
+
+        combined /= total_weight
+        return {
+            "predictions": self.classes_[np.argmax(combined, axis=1)],
+            "probabilities": combined,
+            "members": status,
+        }
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
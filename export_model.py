@@ -0,0 +1,61 @@
+# export_model.py
+# Writes stress_model.pkl + features.pkl to the portable JSON format read by
+# portable_model.py, then checks the export against the original on the dataset.
+# Usage: python export_model.py [output_path]
+import json
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from portable_model import FORMAT_NAME, FORMAT_VERSION, load_portable_model
+
+
+def export_model(model, features, path):
+    classes = model.classes_.tolist()
+    if len(classes) < 3:
+        raise ValueError("Only multinomial (3+ class) logistic regression is supported")
+    if getattr(model, "multi_class", "multinomial") == "ovr":
+        raise ValueError("One-vs-rest logistic regression is not supported")
+    if hasattr(model, "feature_names_in_") and list(model.feature_names_in_) != list(features):
+        raise ValueError("features.pkl does not match the model's training columns")
+
+    spec = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "model_type": "multinomial_logistic_regression",
+        "features": list(features),
+        "classes": classes,
+        # json writes floats with repr(), which round-trips float64 exactly
+        "coef": model.coef_.tolist(),
+        "intercept": model.intercept_.tolist(),
+    }
+    with open(path, "w") as f:
+        json.dump(spec, f, indent=2)
+        f.write("\n")
+
+
+def verify_export(model, path, csv_path="StressLevelDataset.csv"):
+    portable = load_portable_model(path)
+    X = pd.read_csv(csv_path)[portable.features]
+
+    expected = model.predict_proba(X)
+    actual = portable.predict_proba(X)
+    if not np.array_equal(expected, actual):
+        raise AssertionError(
+            f"predict_proba differs, max abs diff {np.abs(expected - actual).max():.3e}"
+        )
+    if not np.array_equal(model.predict(X), portable.predict(X)):
+        raise AssertionError("predict differs from the original model")
+    return len(X)
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else "stress_model.json"
+    model = joblib.load("stress_model.pkl")
+    features = joblib.load("features.pkl")
+
+    export_model(model, features, output)
+    n_rows = verify_export(model, output)
+    print(f"Exported to {output}; predict_proba identical on {n_rows} rows")
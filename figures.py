@@ -0,0 +1,261 @@
+# figures.py
+# Plotly panels shared by the Streamlit dashboard (app.py) and the batch
+# report generator (generate_reports.py). Dataset-level "base" figures are
+# built once and copied with go.Figure(...) before per-student overlays are
+# added, so callers never mutate a shared base.
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Color scheme - More vibrant
+color_discrete_map = {
+    "Low": "#10b981",
+    "Medium": "#f59e0b",
+    "High": "#ef4444"
+}
+
+# Prepare prediction value mapping
+pred_val_map = {"Low": 0, "Medium": 1, "High": 2}
+
+mental_cols = ["anxiety_level", "social_support", "future_career_concerns"]
+
+
+def load_dataset(path="StressLevelDataset.csv"):
+    df = pd.read_csv(path)
+    df["stress_label"] = df["stress_level"].map({
+        0: "Low",
+        1: "Medium",
+        2: "High"
+    })
+    return df
+
+
+def top_factor_ranking(model, features):
+    # Top contributing factors only depend on the model coefficients
+    coef = pd.Series(model.coef_[0], index=features)
+    top_factors = coef.abs().sort_values(ascending=False).head(3)
+    top_factor_names = [f.replace('_', ' ').title() for f in top_factors.index.tolist()]
+    return top_factors, top_factor_names
+
+
+# ------------------------------
+# Key Metrics
+# ------------------------------
+def gauge_figure(risk_score):
+    # Create a gauge chart for confidence
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=risk_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Confidence Score", 'font': {'size': 22, 'color': 'white', 'weight': 'bold'}},
+        number={'suffix': "%", 'font': {'size': 40, 'color': 'white', 'family': 'Poppins'}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': "white"},
+            'bar': {'color': "#fbbf24", 'thickness': 0.8},
+            'bgcolor': "rgba(255,255,255,0.1)",
+            'borderwidth': 3,
+            'bordercolor': "rgba(255,255,255,0.3)",
+            'steps': [
+                {'range': [0, 33], 'color': 'rgba(16, 185, 129, 0.3)'},
+                {'range': [33, 66], 'color': 'rgba(245, 158, 11, 0.3)'},
+                {'range': [66, 100], 'color': 'rgba(239, 68, 68, 0.3)'}
+            ],
+            'threshold': {
+                'line': {'color': "white", 'width': 4},
+                'thickness': 0.75,
+                'value': 80
+            }
+        }
+    ))
+
+    fig_gauge.update_layout(
+        height=250,
+        margin=dict(l=20, r=20, t=50, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font={'color': "white", 'family': "Poppins"}
+    )
+    return fig_gauge
+
+
+def top_factors_figure(top_factors, top_factor_names):
+    # Create horizontal bar chart for top factors with better colors
+    colors_map = {
+        0: '#10b981',  # Green
+        1: '#f59e0b',  # Orange
+        2: '#ef4444'   # Red
+    }
+
+    bar_colors = [colors_map[i] for i in range(len(top_factors))]
+
+    fig_factors = go.Figure(go.Bar(
+        y=top_factor_names,
+        x=top_factors.abs().values,
+        orientation='h',
+        marker=dict(
+            color=bar_colors,
+            line=dict(color='rgba(255, 255, 255, 0.5)', width=2)
+        ),
+        text=[f'{val:.2f}' for val in top_factors.abs().values],
+        textposition='auto',
+        textfont=dict(color='white', size=14, family='Poppins', weight='bold')
+    ))
+
+    fig_factors.update_layout(
+        height=250,
+        margin=dict(l=210, r=10, t=0, b=20, autoexpand=False),  # Fixed margins
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
+        yaxis=dict(showgrid=False, tickfont=dict(color='white', size=16, family='Poppins'), automargin=False),
+        font={'family': "Poppins", 'size': 16, 'color': 'white'},
+        showlegend=False
+    )
+    return fig_factors
+
+
+# ------------------------------
+# Profile vs Average
+# ------------------------------
+def radar_base(df, features):
+    # Radar chart for user profile
+    categories = [f.replace('_', ' ').title() for f in features]
+    avg_values = [df[f].mean() for f in features]
+
+    fig_radar = go.Figure()
+
+    # Average student profile
+    fig_radar.add_trace(go.Scatterpolar(
+        r=avg_values,
+        theta=categories,
+        fill='toself',
+        name='Average Student',
+        line_color='rgba(59, 130, 246, 0.8)',
+        fillcolor='rgba(59, 130, 246, 0.3)',
+        line_width=3
+    ))
+
+    fig_radar.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 3],
+                tickfont=dict(size=10, color='white'),
+                gridcolor='rgba(255,255,255,0.2)'
+            ),
+            angularaxis=dict(
+                tickfont=dict(size=11, color='white'),
+                gridcolor='rgba(255,255,255,0.2)'
+            ),
+            bgcolor='rgba(255,255,255,0.05)'
+        ),
+        showlegend=True,
+        title=" Your Profile vs Average Student",
+        title_font_size=20,
+        title_font_color="white",
+        height=430,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5, font=dict(color='white')),
+        paper_bgcolor='rgba(1,0,0,0)',
+        font=dict(color='white', family='Poppins')
+    )
+    return fig_radar, categories
+
+
+def add_radar_overlay(fig_radar, categories, user_values):
+    # User profile
+    fig_radar.add_trace(go.Scatterpolar(
+        r=user_values,
+        theta=categories,
+        fill='toself',
+        name='Your Profile',
+        line_color='#fbbf24',
+        fillcolor='rgba(251, 191, 36, 0.3)',
+        line_width=3
+    ))
+    return fig_radar
+
+
+# ------------------------------
+# Box-plot Placement
+# ------------------------------
+def mental_health_base(df):
+    df_long = df.melt(
+        id_vars="stress_label",
+        value_vars=mental_cols,
+        var_name="Feature",
+        value_name="Score"
+    )
+
+    df_long["Feature"] = df_long["Feature"].apply(lambda x: x.replace('_', ' ').title())
+
+    fig2 = px.box(
+        df_long,
+        x="stress_label",
+        y="Score",
+        color="Feature",
+        title=" Mental Health & Support Factors Across Stress Levels",
+        color_discrete_sequence=['#3b82f6', '#8b5cf6', '#ec4899']
+    )
+
+    fig2.update_layout(
+        template="plotly_dark",
+        title_font_size=20,
+        title_font_color="white",
+        height=450,
+        xaxis_title="Stress Level",
+        yaxis_title="Score",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(255,255,255,0.05)',
+        font=dict(color='white', family='Poppins'),
+        legend=dict(font=dict(color='white'))
+    )
+    return fig2
+
+
+def add_mental_health_overlay(fig2, stress_pred, user_input):
+    # Add user input points
+    for i, feature in enumerate(mental_cols):
+        fig2.add_scatter(
+            x=[stress_pred],
+            y=[user_input[feature]],
+            mode="markers",
+            marker=dict(size=16, color='#fbbf24', symbol="diamond", line=dict(color='white', width=3)),
+            name=f"Your {feature.replace('_', ' ').title()}",
+            showlegend=(i == 0),
+            legendgroup="user"
+        )
+    return fig2
+
+
+def sleep_quality_base(df):
+    fig6 = px.box(
+        df,
+        x="stress_label",
+        y="sleep_quality",
+        color="stress_label",
+        title=" Sleep Quality Distribution by Stress Level",
+        labels={"stress_label": "Stress Level", "sleep_quality": "Sleep Quality"},
+        color_discrete_map=color_discrete_map
+    )
+
+    fig6.update_layout(
+        template="plotly_dark",
+        title_font_size=20,
+        title_font_color="white",
+        height=400,
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(255,255,255,0.05)',
+        font=dict(color='white', family='Poppins')
+    )
+    return fig6
+
+
+def add_sleep_quality_overlay(fig6, stress_pred, sleep_quality):
+    fig6.add_scatter(
+        x=[stress_pred],
+        y=[sleep_quality],
+        mode="markers",
+        marker=dict(size=22, color="#fbbf24", symbol="star", line=dict(color='white', width=3)),
+        name="You"
+    )
+    return fig6
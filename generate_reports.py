@@ -0,0 +1,278 @@
+# generate_reports.py
+# Writes one static HTML stress report per student in a cohort CSV, with the
+# same panels as the dashboard: prediction badge, confidence gauge, top
+# factors, radar vs the average student and box-plot placement.
+#
+# The cohort is scored in one vectorized model call. Each worker process
+# builds the dataset-level figures once and serializes them to JSON once;
+# a report then only serializes the student's overlay traces and gauge.
+#
+# Usage: python generate_reports.py [cohort.csv] [--output reports] [--workers N]
+import argparse
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from plotly.utils import PlotlyJSONEncoder
+
+import figures
+
+PLOTLY_JS = "plotly.min.js"
+
+
+# -------------------------
+# Model & Scoring
+# -------------------------
+def load_scorer(model_path=None):
+    # Same preference as main.py: portable export (MODEL_PATH) first, joblib
+    # pickle as fallback
+    model_path = model_path or os.getenv("MODEL_PATH", "stress_model.json")
+    if os.path.exists(model_path):
+        from portable_model import load_portable_model
+
+        model = load_portable_model(model_path)
+        return model, model.features
+
+    import joblib
+
+    return joblib.load("stress_model.pkl"), joblib.load("features.pkl")
+
+
+def score_cohort(model, features, cohort_df):
+    input_df = cohort_df[features]
+    predictions = model.predict(input_df)
+    risk_scores = model.predict_proba(input_df).max(axis=1) * 100
+    return predictions, risk_scores
+
+
+# -------------------------
+# Figure Rendering
+# -------------------------
+def _to_json(obj):
+    return json.dumps(obj, cls=PlotlyJSONEncoder)
+
+
+class FigureBase:
+    """A dataset-level figure serialized once; overlays are appended as JSON."""
+
+    def __init__(self, fig):
+        spec = fig.to_plotly_json()
+        self.data_json = _to_json(spec["data"])[1:-1]
+        self.layout_json = _to_json(spec["layout"])
+
+    def render(self, div_id, overlay=None):
+        data = self.data_json
+        if overlay is not None and overlay.data:
+            data += "," + _to_json(overlay.to_plotly_json()["data"])[1:-1]
+        return _plot_html(div_id, "[" + data + "]", self.layout_json)
+
+
+def _plot_html(div_id, data_json, layout_json):
+    return (
+        f'<div id="{div_id}" class="panel"></div>\n'
+        f'<script>Plotly.newPlot("{div_id}", {data_json}, {layout_json}, {{"responsive": true}});</script>'
+    )
+
+
+def _figure_html(div_id, fig):
+    spec = fig.to_plotly_json()
+    return _plot_html(div_id, _to_json(spec["data"]), _to_json(spec["layout"]))
+
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Stress Report - {student_id}</title>
+<script src="{plotly_js}"></script>
+<style>
+    body {{
+        font-family: 'Poppins', sans-serif;
+        background: linear-gradient(135deg, #1e3c72 0%, #2a5298 50%, #7e22ce 100%);
+        color: white;
+        margin: 0;
+        padding: 30px;
+    }}
+    h1 {{ text-align: center; }}
+    .row {{ display: flex; flex-wrap: wrap; gap: 20px; align-items: center; }}
+    .row > div {{ flex: 1 1 380px; }}
+    .stress-badge {{
+        display: inline-block;
+        padding: 25px 50px;
+        border-radius: 50px;
+        font-size: 1.5rem;
+        font-weight: 800;
+        text-transform: uppercase;
+        letter-spacing: 3px;
+        border: 3px solid rgba(255, 255, 255, 0.5);
+    }}
+    .stress-low {{ background: linear-gradient(135deg, #10b981 0%, #059669 100%); }}
+    .stress-medium {{ background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%); }}
+    .stress-high {{ background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); }}
+</style>
+</head>
+<body>
+<h1>Student Stress Report: {student_id}</h1>
+<div class="row">
+<div style="text-align: center;"><div class="stress-badge stress-{stress_class}">{stress_pred}</div></div>
+<div>{gauge}</div>
+<div><p style="font-size: 22px; font-weight: bold;">Top Factors</p>{top_factors}</div>
+</div>
+<p>Predicted stress level is <strong>{stress_pred}</strong> with <strong>{risk_score:.1f}%</strong> confidence.
+Key areas to focus on: {focus_areas}.</p>
+<hr>
+<div class="row">
+<div>{radar}</div>
+<div>{sleep_quality}</div>
+</div>
+{mental_health}
+</body>
+</html>
+"""
+
+# Per-process state, filled in by _init_worker
+_worker = {}
+
+
+def _init_worker(reference_path, features, top_factors, top_factor_names, output_dir):
+    df = figures.load_dataset(reference_path)
+    radar_fig, categories = figures.radar_base(df, features)
+    _worker.update(
+        features=features,
+        categories=categories,
+        output_dir=output_dir,
+        focus_areas=", ".join(top_factor_names),
+        # The top factors chart is model-level, identical for every student
+        top_factors_html=_figure_html("top-factors", figures.top_factors_figure(top_factors, top_factor_names)),
+        radar=FigureBase(radar_fig),
+        mental_health=FigureBase(figures.mental_health_base(df)),
+        sleep_quality=FigureBase(figures.sleep_quality_base(df)),
+    )
+
+
+def render_report(task):
+    student_id, file_name, values, stress_pred, risk_score = task
+    user_input = dict(zip(_worker["features"], values))
+
+    radar_overlay = figures.add_radar_overlay(go.Figure(), _worker["categories"], list(values))
+    mental_overlay = figures.add_mental_health_overlay(go.Figure(), stress_pred, user_input)
+    sleep_overlay = figures.add_sleep_quality_overlay(go.Figure(), stress_pred, user_input["sleep_quality"])
+
+    page = REPORT_TEMPLATE.format(
+        student_id=html.escape(str(student_id)),
+        plotly_js=PLOTLY_JS,
+        stress_pred=stress_pred,
+        stress_class=stress_pred.lower(),
+        risk_score=risk_score,
+        focus_areas=_worker["focus_areas"],
+        gauge=_figure_html("gauge", figures.gauge_figure(risk_score)),
+        top_factors=_worker["top_factors_html"],
+        radar=_worker["radar"].render("radar", radar_overlay),
+        sleep_quality=_worker["sleep_quality"].render("sleep-quality", sleep_overlay),
+        mental_health=_worker["mental_health"].render("mental-health", mental_overlay),
+    )
+
+    path = os.path.join(_worker["output_dir"], f"{file_name}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+    return path
+
+
+# -------------------------
+# Batch Driver
+# -------------------------
+def unique_file_names(student_ids):
+    """
+    Map IDs to distinct, filesystem-safe file names (without extension).
+
+    IDs are reduced to a safe character set, so different IDs can end up
+    equal ("a b" and "a_b"), and IDs may repeat in the cohort. Later
+    duplicates get a numeric suffix (_2, _3, ...) instead of overwriting an
+    earlier report. Names are compared case-insensitively for filesystems
+    that ignore case, and "index" is reserved for the cohort index.
+    """
+    used = {"index"}
+    names = []
+    for sid in student_ids:
+        base = re.sub(r"[^\w.-]", "_", sid) or "_"
+        name, n = base, 2
+        while name.lower() in used:
+            name, n = f"{base}_{n}", n + 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def write_index(output_dir, rows):
+    items = "\n".join(
+        f'<li><a href="{html.escape(name)}.html">{html.escape(sid)}</a> - {pred} ({score:.1f}%)</li>'
+        for sid, name, pred, score in rows
+    )
+    with open(os.path.join(output_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Cohort Stress Reports</title></head>\n"
+                f"<body><h1>Cohort Stress Reports</h1>\n<ul>\n{items}\n</ul></body></html>\n")
+
+
+def generate_reports(cohort_path, output_dir="reports", workers=None, id_column=None,
+                     reference_path="StressLevelDataset.csv"):
+    start = time.perf_counter()
+    model, features = load_scorer()
+    cohort_df = pd.read_csv(cohort_path)
+
+    predictions, risk_scores = score_cohort(model, features, cohort_df)
+    if id_column:
+        student_ids = cohort_df[id_column].fillna("").astype(str).tolist()
+    else:
+        width = len(str(len(cohort_df)))
+        student_ids = [f"student_{i:0{width}d}" for i in range(1, len(cohort_df) + 1)]
+    file_names = unique_file_names(student_ids)
+
+    values = cohort_df[features].astype(int).to_numpy().tolist()
+    tasks = [
+        (sid, name, row, str(pred), float(score))
+        for sid, name, row, pred, score in zip(student_ids, file_names, values, predictions, risk_scores)
+    ]
+
+    os.makedirs(output_dir, exist_ok=True)
+    # plotly.js is written once and shared by every report, keeping them offline and small
+    with open(os.path.join(output_dir, PLOTLY_JS), "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+
+    top_factors, top_factor_names = figures.top_factor_ranking(model, features)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(reference_path, features, top_factors, top_factor_names, output_dir),
+    ) as pool:
+        paths = list(pool.map(render_report, tasks, chunksize=chunksize))
+
+    write_index(output_dir, [(sid, name, pred, score) for sid, name, _, pred, score in tasks])
+    elapsed = time.perf_counter() - start
+    return paths, elapsed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate static stress reports for a cohort")
+    parser.add_argument("cohort", nargs="?", default="StressLevelDataset.csv",
+                        help="CSV with one row per student and the model's feature columns")
+    parser.add_argument("--output", default="reports")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all CPUs)")
+    parser.add_argument("--id-column", help="column used to name each report")
+    parser.add_argument("--reference", default="StressLevelDataset.csv",
+                        help="dataset behind the average-student and box-plot panels")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    paths, elapsed = generate_reports(args.cohort, args.output, args.workers, args.id_column, args.reference)
+    print(f"Wrote {len(paths)} reports to {args.output}/ in {elapsed:.2f}s "
+          f"({len(paths) / elapsed:.1f} reports/s)")
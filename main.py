@@ -1,10 +1,18 @@
 # main.py
-from fastapi import FastAPI
+import os
+from typing import List, Optional
+
+from fastapi import FastAPI, Header
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import joblib
 import pandas as pd
 import numpy as np
 
+from audit_log import AuditLogger, model_version
+from dedup import IdempotencyConflict, RequestCoalescer, content_key
+from monitoring import DriftMonitor
+from portable_model import load_portable_model
+
 # -------------------------
 # Input Schema
 # -------------------------
@@ -35,9 +43,58 @@ class StudentData(BaseModel):
 # -------------------------
 app = FastAPI(title="AI Stress Predictor")
 
-# Load ML model & features
-model = joblib.load("stress_model.pkl")
-features = joblib.load("features.pkl")
+# Load ML model & features. The portable export (see export_model.py) only
+# needs NumPy; the joblib pickle is the fallback when it hasn't been generated.
+model_path = os.getenv("MODEL_PATH", "stress_model.json")
+if os.path.exists(model_path):
+    model = load_portable_model(model_path)
+    features = model.features
+else:
+    import joblib
+
+    model_path = "stress_model.pkl"
+    model = joblib.load(model_path)
+    features = joblib.load("features.pkl")
+
+# Reference distributions for drift monitoring, built once from the training CSV
+reference_df = pd.read_csv("StressLevelDataset.csv")
+monitor = DriftMonitor(
+    reference_df,
+    [col for col in reference_df.columns if col != "stress_level"],
+    window_seconds=float(os.getenv("DRIFT_WINDOW_SECONDS", "3600"))
+)
+
+# Every prediction is recorded for compliance; set AUDIT_LOG_PATH="" to disable
+audit_log_path = os.getenv("AUDIT_LOG_PATH", "audit_log.db")
+audit_logger = (
+    AuditLogger(audit_log_path, model_version=model_version(model_path))
+    if audit_log_path else None
+)
+
+# Ensemble serving is opt-in: set ENSEMBLE_REGISTRY to a registry written by
+# train_ensemble.py (e.g. models/ensemble.json). joblib/sklearn are only
+# imported in that case.
+ensemble_registry = os.getenv("ENSEMBLE_REGISTRY", "")
+ensemble = None
+if ensemble_registry:
+    from ensemble import EnsembleScorer
+
+    # Enough workers for every request the server threadpool (40 threads by
+    # default) can run at once, so members don't queue behind other requests
+    ensemble = EnsembleScorer.from_registry(
+        ensemble_registry, concurrency=int(os.getenv("ENSEMBLE_CONCURRENCY", "40"))
+    )
+    ensemble_version = "ensemble-" + model_version(ensemble_registry)
+
+# Duplicate requests within the TTL reuse the stored response
+coalescer = RequestCoalescer(ttl=float(os.getenv("DEDUP_TTL_SECONDS", "30")))
+
+@app.on_event("shutdown")
+def flush_audit_log():
+    if audit_logger is not None:
+        audit_logger.close()
+    if ensemble is not None:
+        ensemble.close()
 
 # -------------------------
 # Home Route
@@ -47,62 +104,165 @@ def home():
     return {"message": "AI Stress Predictor API is running"}
 
 # -------------------------
-# Prediction Endpoint
+# Scoring
 # -------------------------
-@app.post("/predict-stress")
-def predict_stress(data: StudentData):
-    try:
-        # Convert input to dict and fill missing features
-        input_dict = data.dict()
+def build_advice(prediction, top_factors):
+    # Dynamic GenAI-style advice per factor
+    advice_parts = []
+    for factor in top_factors:
+        if "sleep" in factor:
+            advice_parts.append(f"Improve your {factor.replace('_',' ')} to reduce stress.")
+        elif "study" in factor or "academic" in factor:
+            advice_parts.append(f"Manage your {factor.replace('_',' ')} for better balance.")
+        elif "anxiety" in factor or "depression" in factor:
+            advice_parts.append(f"Practice mindfulness to lower {factor.replace('_',' ')}.")
+        elif "social_support" in factor or "peer" in factor:
+            advice_parts.append(f"Engage with supportive friends to improve {factor.replace('_',' ')}.")
+        else:
+            advice_parts.append(f"Work on {factor.replace('_',' ')} to reduce stress.")
+
+    return (
+        f"Your predicted stress level is {prediction}. "
+        f"The top factors contributing to your stress are {', '.join(top_factors) if top_factors else 'not available'}. "
+        + " ".join(advice_parts)
+    )
+
+def score_students(input_dicts):
+    # Fill missing features
+    input_dicts = [dict(d) for d in input_dicts]
+    for input_dict in input_dicts:
         for feat in features:
             if feat not in input_dict:
                 input_dict[feat] = 0
 
-        # Create DataFrame in correct order
-        input_df = pd.DataFrame([input_dict])[features]
-
-        # Predict stress level (string labels: 'High', 'Low', 'Medium')
-        prediction = model.predict(input_df)[0]
-        proba = model.predict_proba(input_df)[0]
-
-        # Compute top 3 stress factors safely
-        try:
-            coefs = model.coef_[0]
-            impact_df = pd.DataFrame({
-                "feature": features,
-                "impact": coefs * input_df.iloc[0].values
-            }).sort_values(by="impact", key=abs, ascending=False)
-            top_factors = impact_df["feature"].head(3).tolist()
-        except Exception:
-            top_factors = []
-
-        # Dynamic GenAI-style advice per factor
-        advice_parts = []
-        for factor in top_factors:
-            value = input_dict.get(factor, 0)
-            if "sleep" in factor:
-                advice_parts.append(f"Improve your {factor.replace('_',' ')} to reduce stress.")
-            elif "study" in factor or "academic" in factor:
-                advice_parts.append(f"Manage your {factor.replace('_',' ')} for better balance.")
-            elif "anxiety" in factor or "depression" in factor:
-                advice_parts.append(f"Practice mindfulness to lower {factor.replace('_',' ')}.")
-            elif "social_support" in factor or "peer" in factor:
-                advice_parts.append(f"Engage with supportive friends to improve {factor.replace('_',' ')}.")
-            else:
-                advice_parts.append(f"Work on {factor.replace('_',' ')} to reduce stress.")
-
-        advice_text = (
-            f"Your predicted stress level is {prediction}. "
-            f"The top factors contributing to your stress are {', '.join(top_factors) if top_factors else 'not available'}. "
-            + " ".join(advice_parts)
-        )
-
-        return {
+    # Create DataFrame in correct order; one model call scores the whole batch
+    input_df = pd.DataFrame(input_dicts)[features]
+
+    # Predict stress level (string labels: 'High', 'Low', 'Medium')
+    predictions = model.predict(input_df)
+    probas = model.predict_proba(input_df)
+
+    # Compute top 3 stress factors safely
+    try:
+        # Row-wise equivalent of sort_values(key=abs, ascending=False), including
+        # how pandas breaks ties, so batch and single calls rank factors the same
+        impact = np.abs(model.coef_[0] * input_df.to_numpy())
+        n = impact.shape[1]
+        order = (n - 1 - np.argsort(impact[:, ::-1], axis=1, kind="quicksort"))[:, ::-1][:, :3]
+        top_factors_all = [[features[i] for i in row] for row in order]
+    except Exception:
+        top_factors_all = [[] for _ in input_dicts]
+
+    results = []
+    for input_dict, prediction, proba, top_factors in zip(
+        input_dicts, predictions, probas, top_factors_all
+    ):
+        monitor.observe(input_dict, prediction)
+
+        risk_score = round(max(proba) * 100, 2)
+        if audit_logger is not None:
+            audit_logger.log(input_dict, prediction, risk_score, top_factors)
+
+        results.append({
             "stress_level": prediction,
-            "risk_score": round(max(proba) * 100, 2),
+            "risk_score": risk_score,
             "top_factors": top_factors,
-            "advice": advice_text
-        }
+            "advice": build_advice(prediction, top_factors)
+        })
+    return results
+
+def score_student(input_dict):
+    return score_students([input_dict])[0]
+
+# -------------------------
+# Prediction Endpoint
+# -------------------------
+@app.post("/predict-stress")
+def predict_stress(data: StudentData, idempotency_key: Optional[str] = Header(default=None)):
+    try:
+        # Retried calls share one computation: by Idempotency-Key when the
+        # client sends one, otherwise by a hash of the student vector
+        input_dict = data.dict()
+        body_hash = content_key(input_dict)
+        key = f"idem:{idempotency_key}" if idempotency_key else body_hash
+        result, source = coalescer.run(key, lambda: score_student(input_dict), fingerprint=body_hash)
+
+        # score_student logs what it computes; deduplicated responses are
+        # still served predictions, so they get their own audit record
+        if source != "computed" and audit_logger is not None:
+            audit_logger.log(input_dict, result["stress_level"], result["risk_score"],
+                             result["top_factors"], source=source)
+        return result
+
+    except IdempotencyConflict as e:
+        return JSONResponse(status_code=422, content={"error": str(e)})
+
+    except Exception as e:
+        return {"error": str(e)}
+
+# -------------------------
+# Batch Prediction Endpoint
+# -------------------------
+@app.post("/predict-stress-batch")
+def predict_stress_batch(data: List[StudentData]):
+    if not data:
+        return []
+    try:
+        return score_students([item.dict() for item in data])
 
     except Exception as e:
         return {"error": str(e)}
+
+# -------------------------
+# Ensemble Prediction Endpoint
+# -------------------------
+@app.post("/predict-stress-ensemble")
+def predict_stress_ensemble(data: List[StudentData]):
+    if ensemble is None:
+        return {"error": "Ensemble mode is not enabled: set ENSEMBLE_REGISTRY (see train_ensemble.py)"}
+    if not data:
+        return {"members": {}, "results": []}
+    try:
+        input_dicts = [item.dict() for item in data]
+        result = ensemble.score(pd.DataFrame(input_dicts))
+
+        results = []
+        for input_dict, prediction, proba in zip(
+            input_dicts, result["predictions"], result["probabilities"]
+        ):
+            risk_score = round(max(proba) * 100, 2)
+            if audit_logger is not None:
+                audit_logger.log(input_dict, prediction, risk_score, model_version=ensemble_version)
+
+            results.append({
+                "stress_level": prediction,
+                "risk_score": risk_score,
+                "probabilities": {
+                    label: round(float(p), 4) for label, p in zip(ensemble.classes_, proba)
+                }
+            })
+
+        # Members that timed out or failed are reported rather than failing the batch
+        return {"members": result["members"], "results": results}
+
+    except Exception as e:
+        return {"error": str(e)}
+
+# -------------------------
+# Drift Monitoring Endpoint
+# -------------------------
+@app.get("/monitoring/drift")
+def drift_report(refresh: bool = False):
+    return monitor.report(force=refresh)
+
+@app.post("/monitoring/drift/reset")
+def drift_reset():
+    monitor.reset()
+    return {"message": "Drift window cleared"}
+
+# -------------------------
+# Deduplication Metrics
+# -------------------------
+@app.get("/metrics/dedup")
+def dedup_metrics():
+    return coalescer.stats()
@@ -0,0 +1,211 @@
+# monitoring.py
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+STRESS_LABELS = {0: "Low", 1: "Medium", 2: "High"}
+
+# Small constant so empty bins don't blow up the log terms
+EPSILON = 1e-4
+
+
+# -------------------------
+# Divergence Metrics
+# -------------------------
+def _normalize(counts):
+    counts = np.asarray(counts, dtype=float)
+    total = counts.sum()
+    if total == 0:
+        return np.full(len(counts), 1.0 / len(counts))
+    return counts / total
+
+
+def psi(expected, actual):
+    """Population Stability Index between two count/probability vectors."""
+    p = np.clip(_normalize(expected), EPSILON, None)
+    q = np.clip(_normalize(actual), EPSILON, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def kl_divergence(expected, actual):
+    """KL(actual || expected), i.e. how surprising live traffic is under the reference."""
+    p = np.clip(_normalize(expected), EPSILON, None)
+    q = np.clip(_normalize(actual), EPSILON, None)
+    return float(np.sum(q * np.log(q / p)))
+
+
+def drift_status(value):
+    # Usual PSI rule of thumb: < 0.1 stable, < 0.25 moderate shift, otherwise major
+    if value < 0.1:
+        return "stable"
+    if value < 0.25:
+        return "moderate"
+    return "major"
+
+
+# -------------------------
+# Drift Monitor
+# -------------------------
+class DriftMonitor:
+    """
+    Keeps fixed-size histograms of recent inputs and predicted classes.
+
+    Every feature in the training CSV takes small integer values, so each one
+    gets one bin per value seen in the reference data plus an underflow and an
+    overflow bin. Live counts are kept in `n_buckets` rotating time buckets
+    that together cover the last `window_seconds`, so an old backlog of
+    traffic cannot dilute a recent shift. Memory never grows with traffic,
+    `observe` is a handful of counter increments, and divergences are only
+    computed in `report`.
+    """
+
+    def __init__(self, reference_df, feature_names, label_col="stress_level",
+                 refresh_seconds=30.0, window_seconds=3600.0, n_buckets=12, clock=time.time):
+        self.feature_names = list(feature_names)
+        self.refresh_seconds = refresh_seconds
+        self.window_seconds = window_seconds
+        self.n_buckets = n_buckets
+        self.bucket_seconds = window_seconds / n_buckets
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # Reference histograms, laid out as [underflow, lo..hi, overflow]
+        self._bounds = {}
+        self._reference = {}
+        for feat in self.feature_names:
+            values = reference_df[feat].astype(int)
+            lo, hi = int(values.min()), int(values.max())
+            counts = np.zeros(hi - lo + 3, dtype=np.int64)
+            binned = np.bincount(values - lo, minlength=hi - lo + 1)
+            counts[1:-1] = binned
+            self._bounds[feat] = (lo, hi)
+            self._reference[feat] = counts
+
+        self.class_labels = [STRESS_LABELS[k] for k in sorted(STRESS_LABELS)]
+        self._class_index = {label: i for i, label in enumerate(self.class_labels)}
+        label_counts = reference_df[label_col].map(STRESS_LABELS).value_counts()
+        self._reference_classes = np.array(
+            [label_counts.get(label, 0) for label in self.class_labels], dtype=np.int64
+        )
+
+        self._cached_report = None
+        self._cached_at = 0.0
+        self.reset()
+
+    @classmethod
+    def from_csv(cls, path, feature_names, **kwargs):
+        return cls(pd.read_csv(path), feature_names, **kwargs)
+
+    def _empty_bucket(self):
+        # Plain lists: a single int increment is cheaper than indexing a numpy array
+        return {
+            "id": None,
+            "features": {feat: [0] * len(self._reference[feat]) for feat in self.feature_names},
+            "classes": [0] * len(self.class_labels),
+            "n": 0,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._buckets = [self._empty_bucket() for _ in range(self.n_buckets)]
+            self._cached_report = None
+
+    def _bin(self, feat, value):
+        lo, hi = self._bounds[feat]
+        if value < lo:
+            return 0
+        if value > hi:
+            return hi - lo + 2
+        return int(value) - lo + 1
+
+    def _current_bucket(self):
+        # Caller holds the lock. A slot is cleared the first time it is reused,
+        # so rotation costs one pass over the bins per bucket period.
+        bucket_id = int(self._clock() // self.bucket_seconds)
+        bucket = self._buckets[bucket_id % self.n_buckets]
+        if bucket["id"] != bucket_id:
+            for counts in bucket["features"].values():
+                counts[:] = [0] * len(counts)
+            bucket["classes"][:] = [0] * len(bucket["classes"])
+            bucket["n"] = 0
+            bucket["id"] = bucket_id
+        return bucket
+
+    def observe(self, input_dict, prediction):
+        """Record one request. O(1) per feature; safe to call from the request thread."""
+        with self._lock:
+            bucket = self._current_bucket()
+            live = bucket["features"]
+            for feat in self.feature_names:
+                value = input_dict.get(feat)
+                if value is not None:
+                    live[feat][self._bin(feat, value)] += 1
+            idx = self._class_index.get(prediction)
+            if idx is not None:
+                bucket["classes"][idx] += 1
+            bucket["n"] += 1
+
+    def _window_counts(self):
+        # Sum the buckets that still fall inside the window
+        current_id = int(self._clock() // self.bucket_seconds)
+        live = {feat: np.zeros(len(self._reference[feat]), dtype=np.int64) for feat in self.feature_names}
+        live_classes = np.zeros(len(self.class_labels), dtype=np.int64)
+        n_observed = 0
+        with self._lock:
+            for bucket in self._buckets:
+                if bucket["id"] is None or bucket["id"] <= current_id - self.n_buckets:
+                    continue
+                for feat in self.feature_names:
+                    live[feat] += bucket["features"][feat]
+                live_classes += bucket["classes"]
+                n_observed += bucket["n"]
+        window_start = (current_id - self.n_buckets + 1) * self.bucket_seconds
+        return live, live_classes, n_observed, window_start
+
+    def _compute_report(self):
+        live, live_classes, n_observed, window_start = self._window_counts()
+        window = {"window_seconds": self.window_seconds, "window_started_at": window_start}
+
+        if n_observed == 0:
+            return {"observations": 0, **window, "computed_at": time.time(), "status": "no_data"}
+
+        features_report = {}
+        for feat in self.feature_names:
+            value = psi(self._reference[feat], live[feat])
+            lo, hi = self._bounds[feat]
+            features_report[feat] = {
+                "psi": round(value, 4),
+                "kl_divergence": round(kl_divergence(self._reference[feat], live[feat]), 4),
+                "status": drift_status(value),
+                "out_of_range": int(live[feat][0] + live[feat][-1]),
+                "reference_range": [lo, hi],
+            }
+
+        class_psi = psi(self._reference_classes, live_classes)
+        return {
+            "observations": n_observed,
+            **window,
+            "computed_at": time.time(),
+            "features": features_report,
+            "predictions": {
+                "psi": round(class_psi, 4),
+                "kl_divergence": round(kl_divergence(self._reference_classes, live_classes), 4),
+                "status": drift_status(class_psi),
+                "counts": dict(zip(self.class_labels, live_classes.tolist())),
+                "reference_share": dict(zip(
+                    self.class_labels,
+                    np.round(_normalize(self._reference_classes), 4).tolist(),
+                )),
+            },
+        }
+
+    def report(self, force=False):
+        """Drift report for the current window, recomputed at most every `refresh_seconds`."""
+        now = time.time()
+        if (force or self._cached_report is None
+                or now - self._cached_at >= self.refresh_seconds):
+            self._cached_report = self._compute_report()
+            self._cached_at = now
+        return self._cached_report
@@ -0,0 +1,78 @@
+# portable_model.py
+# Minimal scorer for models exported by export_model.py. Needs only NumPy, so
+# the API can serve predictions without joblib, scikit-learn or unpickling.
+import json
+
+import numpy as np
+
+FORMAT_NAME = "stress-model"
+FORMAT_VERSION = 1
+
+
+class PortableLogisticRegression:
+    """
+    Multinomial logistic regression scored from exported parameters.
+
+    Mirrors the parts of sklearn's LogisticRegression that the app uses
+    (`predict`, `predict_proba`, `coef_`, `intercept_`, `classes_`) and
+    performs the same float64 operations in the same order, so probabilities
+    are bit-for-bit identical to the original estimator.
+    """
+
+    def __init__(self, coef, intercept, classes, features):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = np.asarray(intercept, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.features = list(features)
+        self.feature_names_in_ = np.asarray(self.features, dtype=object)
+        self.n_features_in_ = len(self.features)
+
+        if self.coef_.shape != (len(self.classes_), self.n_features_in_):
+            raise ValueError(
+                f"coef has shape {self.coef_.shape}, expected "
+                f"({len(self.classes_)}, {self.n_features_in_})"
+            )
+
+    def _as_array(self, X):
+        # DataFrames are reordered by column name, like sklearn's feature name check
+        if hasattr(X, "columns"):
+            X = X[self.features]
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, expected {self.n_features_in_}")
+        return X
+
+    def decision_function(self, X):
+        return self._as_array(X) @ self.coef_.T + self.intercept_
+
+    def predict_proba(self, X):
+        # Same steps as sklearn.utils.extmath.softmax
+        scores = self.decision_function(X)
+        scores -= scores.max(axis=1).reshape((-1, 1))
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1).reshape((-1, 1))
+        return scores
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.decision_function(X), axis=1)]
+
+
+def load_portable_model(path):
+    with open(path) as f:
+        spec = json.load(f)
+
+    if spec.get("format") != FORMAT_NAME:
+        raise ValueError(f"{path} is not a {FORMAT_NAME} file")
+    if spec.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"{path} uses format version {spec.get('version')}, "
+            f"this loader reads version {FORMAT_VERSION}"
+        )
+    if spec.get("model_type") != "multinomial_logistic_regression":
+        raise ValueError(f"Unsupported model type: {spec.get('model_type')}")
+
+    return PortableLogisticRegression(
+        spec["coef"], spec["intercept"], spec["classes"], spec["features"]
+    )
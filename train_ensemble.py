@@ -0,0 +1,66 @@
+# train_ensemble.py
+# Trains the ensemble members on all 20 input columns of StressLevelDataset.csv
+# and registers them in models/ensemble.json. main.py serves them when started
+# with ENSEMBLE_REGISTRY=models/ensemble.json.
+# Usage: python train_ensemble.py [output_dir]
+import json
+import os
+import sys
+
+import joblib
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from ensemble import EnsembleScorer
+
+MEMBERS = {
+    # Scaled so lbfgs converges on the wider-range columns (self_esteem, depression, ...)
+    "logistic": make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000)),
+    "gradient_boosting": GradientBoostingClassifier(random_state=42),
+    "shallow_tree": DecisionTreeClassifier(max_depth=4, random_state=42),
+}
+
+
+def train(output_dir="models", csv_path="StressLevelDataset.csv"):
+    df = pd.read_csv(csv_path)
+    features = [col for col in df.columns if col != "stress_level"]
+    X = df[features]
+    y = df["stress_level"].map({0: "Low", 1: "Medium", 2: "High"})
+
+    # Same split as the notebook so scores are comparable with stress_model.pkl
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y,
+        test_size=0.2,
+        random_state=42,
+        stratify=y
+    )
+
+    os.makedirs(output_dir, exist_ok=True)
+    registry = {"features": features, "models": []}
+    for name, model in MEMBERS.items():
+        model.fit(X_train, y_train)
+        print(f"{name:<18} accuracy={accuracy_score(y_test, model.predict(X_test)):.4f}")
+
+        filename = f"{name}.pkl"
+        joblib.dump(model, os.path.join(output_dir, filename))
+        registry["models"].append({"name": name, "path": filename, "weight": 1.0, "timeout_ms": 200})
+
+    registry_path = os.path.join(output_dir, "ensemble.json")
+    with open(registry_path, "w") as f:
+        json.dump(registry, f, indent=2)
+        f.write("\n")
+
+    with EnsembleScorer.from_registry(registry_path) as scorer:
+        result = scorer.score(X_test)
+    print(f"{'ensemble':<18} accuracy={accuracy_score(y_test, result['predictions']):.4f}")
+    return registry_path
+
+
+if __name__ == "__main__":
+    train(sys.argv[1] if len(sys.argv) > 1 else "models")